@@ -1,5 +1,8 @@
+import html
 import streamlit as st
+from bisect import bisect_left, insort
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 # --- Configuration ---
 # Setting the page configuration must be done at the top level before any st element
@@ -9,55 +12,208 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Number of task cards rendered per page of the assignments list
+TASKS_PER_PAGE = 20
+
 # --- Session State Initialization ---
 if 'tasks' not in st.session_state:
-    st.session_state.tasks = []
-    # Add a couple of initial mock tasks
-    st.session_state.tasks.append({
-        'id': 1,
-        'subject': 'Physics',
-        'teacher': 'Mr. Smith',
-        'description': 'Solve problem set 3 on thermodynamics.',
-        'dueDate': datetime.now().date() + timedelta(days=5),
-        'isCompleted': False,
-        'customDayLabel': 'Next Fri' # Added custom label for consistency
-    })
-    st.session_state.tasks.append({
-        'id': 2,
-        'subject': 'English',
-        'teacher': 'Ms. Jane',
-        'description': 'Read "The Great Gatsby" chapters 1-3.',
-        'dueDate': datetime.now().date() + timedelta(days=2),
-        'isCompleted': True,
-        'customDayLabel': None # Optional label
-    })
+    today = datetime.now().date()
+    # Tasks are keyed by id so toggle/delete are direct lookups instead of list scans.
+    # Start with a couple of initial mock tasks.
+    st.session_state.tasks = {
+        1: {
+            'id': 1,
+            'subject': 'Physics',
+            'teacher': 'Mr. Smith',
+            'description': 'Solve problem set 3 on thermodynamics.',
+            'dueDate': today + timedelta(days=5),
+            'isCompleted': False,
+            'customDayLabel': 'Next Fri' # Added custom label for consistency
+        },
+        2: {
+            'id': 2,
+            'subject': 'English',
+            'teacher': 'Ms. Jane',
+            'description': 'Read "The Great Gatsby" chapters 1-3.',
+            'dueDate': today + timedelta(days=2),
+            'isCompleted': True,
+            'customDayLabel': None # Optional label
+        },
+    }
+
+# Next id handed out by add_task (ids 1 and 2 are taken by the mock tasks)
+if 'next_task_id' not in st.session_state:
+    st.session_state.next_task_id = 3
+
+# --- Static Markup ---
+# Kept at module level so the strings are built once at import, not on every rerun
+
+# Custom CSS Styling (Light Mode Base)
+_CSS_BLOCK = """
+    <style>
+        /* Set a light background color for the entire page */
+        /* Streamlit uses the .stApp class for the main container */
+        .stApp {
+            background-color: #f0f2f6; /* Light Gray/Slate 100 */
+        }
+        
+        /* Button styling remains fixed for accent color */
+        .stButton>button {
+            width: 100%;
+            background-color: #4f46e5; /* Indigo 600 */
+            color: white;
+            font-weight: bold;
+            border-radius: 0.5rem;
+        }
+        .stButton>button:hover {
+            background-color: #4338ca; /* Indigo 700 */
+        }
+        
+        /* Custom styling for the task list container (Incomplete: White, Complete: Light Gray) */
+        .task-card-incomplete {
+            border-left: 5px solid #4f46e5; /* Indigo Border */
+            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -2px rgba(0, 0, 0, 0.06);
+            background-color: #ffffff; /* White card */
+        }
+        .task-card-complete {
+            border-left: 5px solid #10b981; /* Green Border */
+            opacity: 0.7; /* Fades the whole card when complete */
+            background-color: #f3f4f6; /* Very light gray card */
+        }
+        
+        /* Keep light background for inputs */
+        .stTextInput>div>div>input, .stTextArea>div>div>textarea, .stDateInput>label+div input {
+            background-color: #ffffff; /* White input background */
+        }
+        /* Ensure the form/header containers have the desired light background */
+        .stContainer {
+            background-color: #ffffff; /* White for main blocks */
+            border: none !important; 
+        }
+    </style>
+"""
+
+# Header (Updated for Light Mode)
+_HEADER_HTML = """
+    <div style="text-align: center; padding: 20px; background-color: #ffffff; border-radius: 1rem; margin-bottom: 20px; box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1);">
+        <h1 style="font-size: 2.5rem; font-weight: 800;">📚 School Task Manager</h1>
+        <p style="font-size: 0.875rem;">Tasks are saved for the current browser session only.</p>
+    </div>
+"""
+
+# Per-card styles keyed by completion status (Incomplete: Indigo, Complete: Green + strike-through)
+_CARD_STYLES = {
+    False: {
+        'card_class': 'task-card-incomplete',
+        'subject_style': 'font-weight: bold;',
+        'desc_style': '',
+        'badge_bg': '#4f46e5',
+    },
+    True: {
+        'card_class': 'task-card-complete',
+        'subject_style': 'text-decoration: line-through;',
+        'desc_style': 'text-decoration: line-through;',
+        'badge_bg': '#10b981',
+    },
+}
+
+# Task card: one div holding the text (left) and the due date badge (right).
+# Text color relies on Streamlit's default theme (adapts to light/dark).
+# render_card_html escapes the user text and turns newlines into <br>, so the filled-in
+# template has no stray tags or blank lines and the st.markdown fallback keeps it as one HTML block.
+_CARD_HTML_TEMPLATE = (
+    '<div class="{card_class}" style="padding: 1rem; border-radius: 0.75rem; display: flex; justify-content: space-between; align-items: flex-start; gap: 1rem;">'
+    '<div>'
+    '<p style="{subject_style} margin: 0;">{subject} <span style="font-weight: normal; font-size: 0.875rem;">/ {teacher}</span></p>'
+    '<p style="{desc_style} margin-top: 5px; font-size: 0.875rem;">{description}</p>'
+    '</div>'
+    '<div style="background-color: {badge_bg}; color: white; padding: 5px 10px; border-radius: 1rem; text-align: center; font-size: 0.75rem; font-weight: 600; box-shadow: 0 1px 2px 0 rgba(0, 0, 0, 0.15); white-space: nowrap;">{display_text}</div>'
+    '</div>'
+)
 
 # --- Helper Functions (defined globally) ---
 
+def render_html(markup):
+    """Renders a raw HTML string.
+
+    Uses st.html (Streamlit >= 1.36), which inserts the HTML directly instead of
+    running it through the markdown parser like st.markdown(unsafe_allow_html=True).
+    """
+    if hasattr(st, 'html'):
+        st.html(markup)
+    else:
+        st.markdown(markup, unsafe_allow_html=True)
+
+# Dates repeat heavily across tasks and reruns, so the strftime calls are memoized
+@lru_cache(maxsize=512)
 def get_day_of_week(date_obj):
     """Returns the long weekday name for a date object."""
     if date_obj:
         return date_obj.strftime("%A")
     return ""
 
-def sort_tasks(tasks):
-    """Sorts tasks: Incomplete first, then by earliest due date."""
-    # Sorting key is a tuple: (completion status, due date)
-    return sorted(tasks, key=lambda x: (x['isCompleted'], x['dueDate']))
-
-def add_task(subject, teacher, due_date_str, description, day_label):
-    """Adds a new task to the session state."""
-    try:
-        # Convert YYYY-MM-DD string to Python date object
-        due_date_obj = datetime.strptime(due_date_str, '%Y-%m-%d').date()
-    except ValueError:
-        st.error("Invalid date format.")
-        return
+@lru_cache(maxsize=512)
+def format_due_date(date_obj):
+    """Returns a date object formatted for display, e.g. 'Mar 05, 2025'."""
+    return date_obj.strftime("%b %d, %Y")
+
+def task_sort_key(task):
+    """Returns the ordering key of a task: Incomplete first, then by earliest due date.
+
+    The due date is stored as its ordinal so key comparisons are plain int
+    compares, and the id breaks ties in creation order and makes every key unique.
+    """
+    return (task['isCompleted'], task['dueDate'].toordinal(), task['id'])
+
+def remove_from_task_order(task):
+    """Removes a task's current key from st.session_state.task_order."""
+    order = st.session_state.task_order
+    i = bisect_left(order, task_sort_key(task))
+    if i < len(order) and order[i][-1] == task['id']:
+        del order[i]
+
+def get_sorted_tasks(start=0, stop=None):
+    """Returns the tasks in display order, optionally only the [start:stop] slice.
+
+    task_order is maintained incrementally by add_task, toggle_completion and
+    delete_task, so reruns only look tasks up by id instead of re-sorting.
+    """
+    tasks = st.session_state.tasks
+    return [tasks[key[-1]] for key in st.session_state.task_order[start:stop]]
+
+@lru_cache(maxsize=256)
+def render_card_html(is_completed, subject, teacher, description, due_date, custom_label):
+    """Builds the static HTML of a task card (everything except its widgets).
+
+    The result depends only on the arguments, so unchanged tasks reuse their
+    markup across reruns.
+    """
+    # Calculate date components
+    due_day = get_day_of_week(due_date)
+    formatted_date = format_due_date(due_date)
+
+    # Use custom label if available, otherwise use calculated day
+    display_text = f"{html.escape(custom_label)}, {formatted_date}" if custom_label else f"{due_day}, {formatted_date}"
+
+    # Subject, teacher, description and label are user text: escape them so they can't
+    # inject tags, and keep multi-line descriptions from putting a blank line in the card
+    description_html = html.escape(description).replace('\r\n', '\n').replace('\n', '<br>')
+
+    return _CARD_HTML_TEMPLATE.format(
+        subject=html.escape(subject),
+        teacher=html.escape(teacher),
+        description=description_html,
+        display_text=display_text,
+        **_CARD_STYLES[bool(is_completed)],
+    )
 
-    # Generate a unique ID (simple timestamp-based for this demo)
-    new_id = int(datetime.now().timestamp() * 1000)
+def add_task(subject, teacher, due_date_obj, description, day_label):
+    """Adds a new task to the session state. due_date_obj is a date object."""
+    # Take the next sequential ID; unlike a timestamp it can never collide
+    new_id = st.session_state.next_task_id
+    st.session_state.next_task_id += 1
 
-    st.session_state.tasks.append({
+    task = {
         'id': new_id,
         'subject': subject,
         'teacher': teacher,
@@ -65,81 +221,136 @@ def add_task(subject, teacher, due_date_str, description, day_label):
         'dueDate': due_date_obj,
         'isCompleted': False,
         'customDayLabel': day_label if day_label else None # Store the custom label
-    })
+    }
+    st.session_state.tasks[new_id] = task
+    insort(st.session_state.task_order, task_sort_key(task))
+    # No st.rerun() needed: the form submit already reran the script and cleared the
+    # form, and the task list is rendered after this call in the same run
     st.success("Task added successfully!")
-    st.rerun() # Trigger rerun to clear the form and update the list
 
 def toggle_completion(task_id):
-    """Toggles the completion status of a task and reruns the app."""
-    for task in st.session_state.tasks:
-        if task['id'] == task_id:
-            task['isCompleted'] = not task['isCompleted']
-            break
-    # Rerun to update the display immediately and re-sort
-    st.rerun() 
+    """Sets the completion status of a task to the value of its checkbox.
+
+    Used as a widget callback inside the task list fragment, so the fragment
+    rerun that follows redraws the list without an explicit rerun. The checkbox
+    value is applied instead of blindly flipping the flag, so a stale or repeated
+    event that already matches the stored state is a no-op.
+    """
+    task = st.session_state.tasks.get(task_id)
+    if task is None:
+        return
+    is_completed = st.session_state.get(f"check_{task_id}", not task['isCompleted'])
+    if is_completed == task['isCompleted']:
+        return
+    # The completion flag is part of the sort key, so move the task to its new position
+    remove_from_task_order(task)
+    task['isCompleted'] = is_completed
+    insort(st.session_state.task_order, task_sort_key(task))
 
 def delete_task(task_id):
-    """Deletes a task by ID and reruns the app."""
-    st.session_state.tasks = [task for task in st.session_state.tasks if task['id'] != task_id]
-    st.rerun() 
+    """Deletes a task by ID (widget callback, see toggle_completion)."""
+    task = st.session_state.tasks.pop(task_id, None)
+    if task is not None:
+        remove_from_task_order(task)
+
+# --- Derived Session State ---
+# Sort keys of all tasks, kept in display order and updated in place on add/toggle/delete.
+# Initialized here, after task_sort_key is defined, so there is only one definition of the key.
+if 'task_order' not in st.session_state:
+    st.session_state.task_order = sorted(map(task_sort_key, st.session_state.tasks.values()))
+
+# --- Task List Fragment ---
+# st.fragment is only available from Streamlit 1.37; 1.33-1.36 ship it as st.experimental_fragment.
+# On older versions the list falls back to rerunning with the rest of the page.
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', lambda func: func)
+
+@_fragment
+def render_task_list():
+    """Renders the sorted task cards.
+
+    Runs as a fragment: the checkbox and delete callbacks only rerun this
+    function, not the CSS, header and form in main().
+    """
+    task_count = len(st.session_state.task_order)
+
+    if not task_count:
+        st.info("No assignments yet! Add a new task above.")
+    else:
+        # Only one page of cards is rendered, so the widget count per rerun stays
+        # bounded however many tasks there are. The page selector has no max_value,
+        # so the range is enforced here: clamp the page in case deletes removed the
+        # last page or the user typed a page past the end.
+        page_count = -(-task_count // TASKS_PER_PAGE)
+        if st.session_state.get('task_page', 1) > page_count:
+            st.session_state.task_page = page_count
+        page = st.session_state.get('task_page', 1) if page_count > 1 else 1
+        start = (page - 1) * TASKS_PER_PAGE
+
+        # Loop through sorted tasks and render cards
+        for task in get_sorted_tasks(start, start + TASKS_PER_PAGE):
+            card_html = render_card_html(
+                task['isCompleted'],
+                task['subject'],
+                task['teacher'],
+                task['description'],
+                task['dueDate'],
+                task.get('customDayLabel'),
+            )
+
+            # Use st.container to create the card layout
+            with st.container(border=True):
+                # 1. Subject, Teacher, Description and Due Date Badge in a single HTML element
+                render_html(card_html)
+
+                # Native widgets can't live inside the HTML, so they get their own row below it
+                cols = st.columns([0.90, 0.10])
+
+                # 2. Checkbox
+                cols[0].checkbox(
+                    label="", 
+                    value=task['isCompleted'], 
+                    # Ensure a stable, unique key for the checkbox
+                    key=f"check_{task['id']}", 
+                    on_change=toggle_completion, 
+                    args=(task['id'],) # Pass the task ID to the callback
+                )
+
+                # 3. Delete Button
+                cols[1].button(
+                    "🗑️",
+                    # Ensure a stable, unique key for the button
+                    key=f"del_{task['id']}",
+                    on_click=delete_task,
+                    args=(task['id'],),
+                    use_container_width=True
+                )
+
+        # Page selector beneath the list (only needed once there is more than one page).
+        # Label and bounds are fixed: Streamlit derives the widget identity from them,
+        # so putting page_count in either would reset the page whenever it changes.
+        if page_count > 1:
+            st.number_input(
+                "Page",
+                min_value=1,
+                step=1,
+                key='task_page'
+            )
+            st.caption(f"of {page_count}")
 
 # --- Main Application Function ---
 def main():
     # --- Custom CSS Styling (Light Mode Base) ---
-    st.markdown("""
-        <style>
-            /* Set a light background color for the entire page */
-            /* Streamlit uses the .stApp class for the main container */
-            .stApp {
-                background-color: #f0f2f6; /* Light Gray/Slate 100 */
-            }
-            
-            /* Button styling remains fixed for accent color */
-            .stButton>button {
-                width: 100%;
-                background-color: #4f46e5; /* Indigo 600 */
-                color: white;
-                font-weight: bold;
-                border-radius: 0.5rem;
-            }
-            .stButton>button:hover {
-                background-color: #4338ca; /* Indigo 700 */
-            }
-            
-            /* Custom styling for the task list container (Incomplete: White, Complete: Light Gray) */
-            .task-card-incomplete {
-                border-left: 5px solid #4f46e5; /* Indigo Border */
-                box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -2px rgba(0, 0, 0, 0.06);
-                background-color: #ffffff; /* White card */
-            }
-            .task-card-complete {
-                border-left: 5px solid #10b981; /* Green Border */
-                opacity: 0.7; /* Fades the whole card when complete */
-                background-color: #f3f4f6; /* Very light gray card */
-            }
-            
-            /* Keep light background for inputs */
-            .stTextInput>div>div>input, .stTextArea>div>div>textarea, .stDateInput>label+div input {
-                background-color: #ffffff; /* White input background */
-            }
-            /* Ensure the form/header containers have the desired light background */
-            .stContainer {
-                background-color: #ffffff; /* White for main blocks */
-                border: none !important; 
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    # Emitted on every full run on purpose: Streamlit removes elements that a run
+    # does not re-emit, so a "once per session" guard would drop the styles (and
+    # the header) on the next rerun. Task list interactions skip this anyway,
+    # since they only rerun the render_task_list fragment.
+    # Kept on st.markdown: a style-only st.html still adds an (empty) element to the
+    # page on some Streamlit versions, which shows up as extra space above the header
+    st.markdown(_CSS_BLOCK, unsafe_allow_html=True)
 
 
     # --- Header (Updated for Light Mode) ---
-    st.markdown(
-        """
-        <div style="text-align: center; padding: 20px; background-color: #ffffff; border-radius: 1rem; margin-bottom: 20px; box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1);">
-            <h1 style="font-size: 2.5rem; font-weight: 800;">📚 School Task Manager</h1>
-            <p style="font-size: 0.875rem;">Tasks are saved for the current browser session only.</p>
-        </div>
-        """, unsafe_allow_html=True
-    )
+    render_html(_HEADER_HTML)
     
     # The 'Next Priority Task' display has been removed from here.
 
@@ -158,12 +369,13 @@ def main():
             # Row 2: Due Date, Day of Week (Editable custom label)
             col3, col4 = st.columns(2)
             
-            # Due Date input
-            default_date = datetime.now().date() + timedelta(days=1)
+            # Due Date input (read today once so min_value and the default can't straddle midnight)
+            today = datetime.now().date()
+            default_date = today + timedelta(days=1)
             due_date = col3.date_input(
                 "Due Date", 
                 key='due_date_input', 
-                min_value=datetime.now().date(), 
+                min_value=today, 
                 value=default_date
             )
             
@@ -184,83 +396,14 @@ def main():
                 # Streamlit forms capture all inputs at once on submit
                 if subject and teacher and due_date and description:
                     # Pass the new day_label to the add_task function
-                    add_task(subject, teacher, due_date.strftime('%Y-%m-%d'), description, day_label)
+                    add_task(subject, teacher, due_date, description, day_label)
                 else:
                     st.error("Please fill in all required fields.")
 
 
     # --- Assignments Due List ---
     st.header("📝 Assignments List")
-    sorted_tasks = sort_tasks(st.session_state.tasks)
-
-    if not sorted_tasks:
-        st.info("No assignments yet! Add a new task above.")
-    else:
-        # Loop through sorted tasks and render cards
-        for task in sorted_tasks:
-            card_class = "task-card-complete" if task['isCompleted'] else "task-card-incomplete"
-            
-            # Calculate date components
-            due_day = get_day_of_week(task['dueDate'])
-            formatted_date = task['dueDate'].strftime("%b %d, %Y")
-            
-            # Use custom label if available, otherwise use calculated day
-            custom_label = task.get('customDayLabel')
-            display_text = f"{custom_label}, {formatted_date}" if custom_label else f"{due_day}, {formatted_date}"
-            
-            # Conditional text styling using inline HTML/CSS (Kept adaptive font logic)
-            subject_style = 'text-decoration: line-through;' if task['isCompleted'] else 'font-weight: bold;'
-            desc_style = 'text-decoration: line-through;' if task['isCompleted'] else ''
-            
-            # Badge color remains the same (Indigo/Green)
-            date_badge_bg = '#10b981' if task['isCompleted'] else '#4f46e5'
-
-            # Use st.container to create the card layout
-            with st.container(border=True):
-                # Apply custom CSS class for visual styling
-                st.markdown(f'<div class="{card_class}" style="padding: 1rem; border-radius: 0.75rem; margin-bottom: 0px;">', unsafe_allow_html=True)
-                
-                cols = st.columns([0.05, 0.65, 0.20, 0.10])
-                
-                # 1. Checkbox
-                cols[0].checkbox(
-                    label="", 
-                    value=task['isCompleted'], 
-                    # Ensure a stable, unique key for the checkbox
-                    key=f"check_{task['id']}", 
-                    on_change=toggle_completion, 
-                    args=(task['id'],) # Pass the task ID to the callback
-                )
-
-                # 2. Subject, Teacher, Description (Using updated styles)
-                with cols[1]:
-                    # Text color relies on Streamlit's default theme (adapts to light/dark)
-                    st.markdown(f"""
-                        <p style="{subject_style} margin: 0;">{task['subject']} <span style="font-weight: normal; font-size: 0.875rem;">/ {task['teacher']}</span></p>
-                        <p style="{desc_style} margin-top: 5px; font-size: 0.875rem;">{task['description']}</p>
-                    """, unsafe_allow_html=True)
-
-                # 3. Due Date Badge
-                with cols[2]:
-                    st.markdown(f"""
-                        <div style="background-color: {date_badge_bg}; color: white; padding: 5px 10px; border-radius: 1rem; text-align: center; font-size: 0.75rem; font-weight: 600; box-shadow: 0 1px 2px 0 rgba(0, 0, 0, 0.15); white-space: nowrap;">
-                            {display_text}
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                # 4. Delete Button
-                cols[3].button(
-                    "🗑️",
-                    # Ensure a stable, unique key for the button
-                    key=f"del_{task['id']}",
-                    on_click=delete_task,
-                    args=(task['id'],),
-                    use_container_width=True
-                )
-
-                st.markdown('</div>', unsafe_allow_html=True) # Close the task card div
-            
-            st.markdown("<br>", unsafe_allow_html=True) # Add spacing between cards
+    render_task_list()
 
 # --- Execution Entry Point ---
 if __name__ == "__main__":